@@ -25,6 +25,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "chat.middleware.MetricsMiddleware",
+    "chat.middleware.RequestInstrumentationMiddleware",
+    "chat.middleware.ReadReplicaPinningMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -58,10 +61,52 @@ ASGI_APPLICATION = "ai_chat.asgi.application"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.environ.get("DJANGO_SQLITE_PATH") or BASE_DIR / "db.sqlite3",
     }
 }
 
+# SQLite profile. "default" keeps Django's defaults (fine for development);
+# "production" is tuned for concurrent writers: WAL journal, synchronous=NORMAL,
+# a busy timeout, memory-mapped I/O, a larger page cache, BEGIN IMMEDIATE for
+# write transactions (so Message.save never fails upgrading a read lock) and
+# persistent connections.
+SQLITE_PROFILE = os.environ.get("DJANGO_SQLITE_PROFILE", "default")
+SQLITE_BUSY_TIMEOUT_S = int(os.environ.get("DJANGO_SQLITE_BUSY_TIMEOUT", "20"))
+SQLITE_PRODUCTION_OPTIONS = {
+    "timeout": SQLITE_BUSY_TIMEOUT_S,
+    "transaction_mode": "IMMEDIATE",
+    "init_command": ";".join([
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_S * 1000}",
+        f"PRAGMA mmap_size={int(os.environ.get('DJANGO_SQLITE_MMAP_SIZE', 256 * 1024 * 1024))}",
+        # Negative cache_size is in KiB
+        f"PRAGMA cache_size=-{int(os.environ.get('DJANGO_SQLITE_CACHE_KB', 64 * 1024))}",
+        "PRAGMA temp_store=MEMORY",
+    ]),
+}
+if SQLITE_PROFILE == "production":
+    DATABASES["default"]["OPTIONS"] = SQLITE_PRODUCTION_OPTIONS
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.environ.get("DJANGO_CONN_MAX_AGE", "600"))
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# Read replica (optional). Reads are routed to DATABASE_READ_ALIAS; writes and
+# any client that wrote in the last DATABASE_READ_STICKY_SECONDS stay on
+# "default". DJANGO_READ_REPLICA_PATH adds a read-only SQLite replica/snapshot
+# as the "replica" alias.
+READ_REPLICA_PATH = os.environ.get("DJANGO_READ_REPLICA_PATH")
+if READ_REPLICA_PATH:
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": f"file:{READ_REPLICA_PATH}?mode=ro",
+        "OPTIONS": {"timeout": SQLITE_BUSY_TIMEOUT_S},
+        "CONN_MAX_AGE": DATABASES["default"].get("CONN_MAX_AGE", 0),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_READ_ALIAS = os.environ.get("DJANGO_READ_DATABASE", "replica" if READ_REPLICA_PATH else "default")
+DATABASE_READ_STICKY_SECONDS = int(os.environ.get("DJANGO_READ_STICKY_SECONDS", "5"))
+DATABASE_ROUTERS = ["chat.routers.ReadReplicaRouter"]
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -87,6 +132,24 @@ REST_FRAMEWORK = {
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-2.5-flash")
 
+# Request instrumentation (opt-in): Server-Timing headers, /api/debug/requests/
+# ring buffer and 1-in-N cProfile sampling (0 disables sampling)
+CHAT_INSTRUMENTATION = os.environ.get("CHAT_INSTRUMENTATION", "0") == "1"
+CHAT_INSTRUMENTATION_BUFFER_SIZE = int(os.environ.get("CHAT_INSTRUMENTATION_BUFFER_SIZE", "200"))
+CHAT_PROFILE_SAMPLE_RATE = int(os.environ.get("CHAT_PROFILE_SAMPLE_RATE", "0"))
+
+# Prometheus-style metrics at /metrics. With several worker processes, point
+# CHAT_METRICS_DIR at a shared directory (cleared on deploy) so any worker can
+# report for the whole pool.
+CHAT_METRICS = os.environ.get("CHAT_METRICS", "1") == "1"
+CHAT_METRICS_DIR = os.environ.get("CHAT_METRICS_DIR") or None
+
+# Cold storage: `manage.py archive_conversations` moves conversations idle this
+# long into compressed archive rows. Codec "auto" uses zstd when the zstandard
+# package is installed and zlib otherwise.
+CHAT_ARCHIVE_IDLE_DAYS = int(os.environ.get("CHAT_ARCHIVE_IDLE_DAYS", "90"))
+CHAT_COMPRESSION_CODEC = os.environ.get("CHAT_COMPRESSION_CODEC", "auto")
+
 # Logging configuration
 # Suppress broken pipe errors - these are harmless and occur when clients disconnect
 # (common with mobile browsers and polling requests)
@@ -0,0 +1,106 @@
+"""
+Concurrent write throughput of the "default" and "production" SQLite profiles.
+
+Each profile runs in its own subprocess against a fresh database file. Worker
+threads append messages through ``Message.objects.create`` (the same
+sequence-allocating path the chat API uses) and the script reports committed
+messages per second and how many writes failed with "database is locked".
+
+    python benchmarks/sqlite_writes.py --threads 8 --messages 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def run_worker(threads: int, messages: int, conversations: int) -> dict:
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ai_chat.settings")
+    import django
+
+    django.setup()
+    from django.core.management import call_command
+    from django.db import OperationalError, connection
+
+    from chat.models import Conversation, Message
+
+    call_command("migrate", verbosity=0)
+    conv_ids = [Conversation.objects.create(title=f"Bench {i}").pk for i in range(conversations)]
+    connection.close()
+
+    committed = 0
+    locked = 0
+    lock = threading.Lock()
+
+    def writer(worker: int) -> None:
+        nonlocal committed, locked
+        ok = errors = 0
+        for i in range(messages):
+            conv_id = conv_ids[(worker + i) % len(conv_ids)]
+            try:
+                Message.objects.create(conversation_id=conv_id, role=Message.ROLE_USER, text="x" * 200)
+                ok += 1
+            except OperationalError:
+                errors += 1
+        connection.close()
+        with lock:
+            committed += ok
+            locked += errors
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=writer, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return {"committed": committed, "locked": locked, "seconds": elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--messages", type=int, default=200, help="messages per thread")
+    parser.add_argument("--conversations", type=int, default=4)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.threads, args.messages, args.conversations)))
+        return
+
+    print(f"{args.threads} threads x {args.messages} messages over {args.conversations} conversations")
+    for profile in ("default", "production"):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(
+                os.environ,
+                DJANGO_SQLITE_PROFILE=profile,
+                DJANGO_SQLITE_PATH=str(Path(tmp) / "bench.sqlite3"),
+                CHAT_METRICS="0",
+            )
+            out = subprocess.run(
+                [sys.executable, __file__, "--worker", "--threads", str(args.threads),
+                 "--messages", str(args.messages), "--conversations", str(args.conversations)],
+                env=env, capture_output=True, text=True, check=True,
+            )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+        rate = result["committed"] / result["seconds"]
+        print(
+            f"{profile:>10}: {result['committed']:>6} committed, {result['locked']:>5} locked, "
+            f"{result['seconds']:.2f}s, {rate:,.0f} msg/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
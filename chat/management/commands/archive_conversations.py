@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from chat.utils.archive import DEFAULT_BATCH_SIZE, archive_idle, idle_conversations
+
+
+class Command(BaseCommand):
+    help = "Move conversations idle past CHAT_ARCHIVE_IDLE_DAYS into compressed cold storage."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--idle-days", type=int, default=settings.CHAT_ARCHIVE_IDLE_DAYS, help="Archive conversations idle for longer than this")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Conversations per transaction")
+        parser.add_argument("--limit", type=int, help="Archive at most this many conversations")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many conversations would be archived")
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            count = idle_conversations(options["idle_days"]).count()
+            self.stdout.write(f"{count} conversations idle for more than {options['idle_days']} days")
+            return
+
+        result = archive_idle(options["idle_days"], batch_size=options["batch_size"], limit=options["limit"])
+        ratio = result.stored_bytes / result.raw_bytes if result.raw_bytes else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {result.conversations} conversations ({result.messages} messages), "
+            f"{result.raw_bytes} bytes stored as {result.stored_bytes} ({ratio:.0%})"
+        ))
@@ -0,0 +1,27 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from chat.utils.export import DEFAULT_CHUNK_SIZE, iter_export
+
+
+class Command(BaseCommand):
+    help = "Stream all conversations, messages and feedback as NDJSON (optionally gzipped)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", "-o", help="File to write to (default: stdout)")
+        parser.add_argument("--gzip", action="store_true", help="Gzip the output")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows fetched per database round trip")
+
+    def handle(self, *args, **options):
+        stream = iter_export(chunk_size=options["chunk_size"], gzip=options["gzip"])
+        if options["output"]:
+            with open(options["output"], "wb") as fh:
+                for chunk in stream:
+                    fh.write(chunk)
+            self.stderr.write(self.style.SUCCESS(f"Exported to {options['output']}"))
+        else:
+            out = sys.stdout.buffer
+            for chunk in stream:
+                out.write(chunk)
+            out.flush()
@@ -0,0 +1,40 @@
+import gzip
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from chat.utils.bulk_import import DEFAULT_BATCH_SIZE, import_transcripts
+
+
+class Command(BaseCommand):
+    help = "Bulk import NDJSON conversation transcripts without generating AI replies."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file to import ('-' for stdin, '.gz' files are decompressed)")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Messages per transaction")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if path == "-":
+            fh = sys.stdin.buffer
+        elif path.endswith(".gz"):
+            fh = gzip.open(path, "rb")
+        else:
+            fh = open(path, "rb")
+
+        start = time.perf_counter()
+        try:
+            result = import_transcripts(fh, batch_size=options["batch_size"])
+        finally:
+            if fh is not sys.stdin.buffer:
+                fh.close()
+        elapsed = time.perf_counter() - start
+
+        for line, error in result.errors:
+            self.stderr.write(f"line {line}: {error}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.conversations} conversations, {result.messages} messages, "
+            f"{result.message_feedback + result.conversation_feedback} feedback rows in {elapsed:.1f}s "
+            f"({result.error_count} lines skipped)"
+        ))
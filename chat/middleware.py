@@ -1,8 +1,24 @@
 """
-Custom middleware to handle broken pipe errors gracefully and reduce log verbosity
+Custom middleware to handle broken pipe errors gracefully, reduce log verbosity
+and instrument requests
 """
 
+import cProfile
+import io
+import itertools
 import logging
+import pstats
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from . import routers
+from .utils import instrumentation, metrics
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
 
 logger = logging.getLogger(__name__)
 
@@ -31,3 +47,123 @@ class SuppressBrokenPipeErrorsMiddleware:
                 from django.http import HttpResponse
                 return HttpResponse(status=200)
             raise
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Opt-in per-request instrumentation (enable with CHAT_INSTRUMENTATION=1).
+
+    Records wall time, database query count/time, outbound LLM time and serializer
+    time for every request. The totals are sent back in a ``Server-Timing`` header
+    and kept in a ring buffer exposed at ``/api/debug/requests/``. When
+    CHAT_PROFILE_SAMPLE_RATE is N > 0, one request in N is run under cProfile and
+    the top of the profile is stored alongside the timings.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "CHAT_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.buffer_size = getattr(settings, "CHAT_INSTRUMENTATION_BUFFER_SIZE", 200)
+        self.sample_rate = getattr(settings, "CHAT_PROFILE_SAMPLE_RATE", 0)
+        self._request_counter = itertools.count(1)
+
+    def __call__(self, request):
+        timings = instrumentation.start_request()
+        profiler = None
+        if self.sample_rate > 0 and next(self._request_counter) % self.sample_rate == 0:
+            profiler = cProfile.Profile()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(instrumentation.db_execute_wrapper))
+                if profiler is not None:
+                    profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    if profiler is not None:
+                        profiler.disable()
+        finally:
+            instrumentation.finish_request()
+
+        total = timings.elapsed()
+        response["Server-Timing"] = instrumentation.server_timing_header(timings, total)
+
+        entry = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "timestamp": time.time(),
+            "total_ms": round(total * 1000, 3),
+            "phases": {
+                phase: {"ms": round(seconds * 1000, 3), "count": timings.counts.get(phase, 0)}
+                for phase, seconds in timings.durations.items()
+            },
+        }
+        if profiler is not None:
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(30)
+            entry["profile"] = out.getvalue()
+        instrumentation.record(entry, maxlen=self.buffer_size)
+        return response
+
+
+class MetricsMiddleware:
+    """Record request latency per view for the ``/metrics`` endpoint (CHAT_METRICS=1)."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "CHAT_METRICS", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        match = getattr(request, "resolver_match", None)
+        metrics.HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - start,
+            view=(match.url_name or match.view_name) if match else "unmatched",
+            method=request.method,
+            status=response.status_code,
+        )
+        return response
+
+
+class ReadReplicaPinningMiddleware:
+    """
+    Keep a client's reads on the primary database for a short window after it writes.
+
+    Unsafe requests are pinned to the primary for their whole duration. When a
+    request writes, a cookie records until when that client's reads stay on the
+    primary (DATABASE_READ_STICKY_SECONDS), so list and insights reads that
+    follow a write never hit a lagging replica.
+    """
+
+    cookie_name = "chat_db_primary_until"
+
+    def __init__(self, get_response):
+        if routers.read_alias() == DEFAULT_DB_ALIAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.window = getattr(settings, "DATABASE_READ_STICKY_SECONDS", 5)
+
+    def __call__(self, request):
+        try:
+            primary_until = float(request.COOKIES.get(self.cookie_name, 0))
+        except ValueError:
+            primary_until = 0.0
+        routers.start_request(pinned=request.method not in SAFE_METHODS or primary_until > time.time())
+        try:
+            response = self.get_response(request)
+            if routers.wrote():
+                response.set_cookie(
+                    self.cookie_name,
+                    f"{time.time() + self.window:.3f}",
+                    max_age=self.window,
+                    httponly=True,
+                    samesite="Lax",
+                )
+            return response
+        finally:
+            routers.start_request()
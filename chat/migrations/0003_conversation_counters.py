@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:07
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Substr
+
+
+def backfill_counters(apps, schema_editor):
+    Conversation = apps.get_model('chat', 'Conversation')
+    Message = apps.get_model('chat', 'Message')
+    ChatCounter = apps.get_model('chat', 'ChatCounter')
+
+    counts = (
+        Message.objects.filter(conversation=OuterRef('pk'))
+        .order_by()
+        .values('conversation')
+        .annotate(n=Count('id'))
+        .values('n')
+    )
+    last = Message.objects.filter(conversation=OuterRef('pk')).order_by('-sequence')
+    # One UPDATE with correlated subqueries; QuerySet.update() leaves updated_at alone
+    Conversation.objects.update(
+        message_count=Coalesce(Subquery(counts), Value(0)),
+        last_message_at=Subquery(last.values('created_at')[:1]),
+        last_message_preview=Coalesce(Substr(Subquery(last.values('text')[:1]), 1, 200), Value('')),
+    )
+    ChatCounter.objects.update_or_create(name='conversations', defaults={'value': Conversation.objects.count()})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0002_conversationfeedback_messagefeedback_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChatCounter',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='last_message_preview',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='message_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -1,17 +1,65 @@
 from __future__ import annotations
 
-from django.db import models, transaction
+import time
+
+from django.db import DatabaseError, models, transaction
+from django.db.models import F
 from django.utils import timezone
 
+from .utils import metrics
+
+
+class ChatCounter(models.Model):
+    """Global counters kept in step with the rows they count, so totals never need COUNT(*)."""
+
+    CONVERSATIONS = "conversations"
+
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    @classmethod
+    def add(cls, name: str, delta: int) -> None:
+        if not cls.objects.filter(name=name).update(value=F("value") + delta):
+            cls.objects.create(name=name, value=delta)
+
+    @classmethod
+    def get_value(cls, name: str) -> int | None:
+        return cls.objects.filter(name=name).values_list("value", flat=True).first()
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.name}={self.value}"
+
 
 class Conversation(models.Model):
+    PREVIEW_LENGTH = 200
+
     title = models.CharField(max_length=200, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized from the message-append path in Message.save()
+    message_count = models.PositiveIntegerField(default=0)
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    last_message_preview = models.CharField(max_length=PREVIEW_LENGTH, blank=True, default="")
+    # Set while the messages live compressed in ConversationArchive (see chat.utils.archive)
+    archived_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ["-updated_at", "id"]
 
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+                ChatCounter.add(ChatCounter.CONVERSATIONS, 1)
+        else:
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            ChatCounter.add(ChatCounter.CONVERSATIONS, -1)
+        return result
+
     def __str__(self) -> str:  # pragma: no cover
         return self.title or f"Conversation {self.pk}"
 
@@ -38,24 +86,61 @@ class Message(models.Model):
         ]
 
     def save(self, *args, **kwargs):
+        adding = self._state.adding
+        if adding:
+            metrics.MESSAGE_SIZE.observe(len(self.text or ""), role=self.role)
         if self.sequence is None:
+            start = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    last = (
+                        Message.objects.select_for_update()
+                        .filter(conversation=self.conversation)
+                        .order_by("-sequence")
+                        .first()
+                    )
+                    self.sequence = 1 if last is None else last.sequence + 1
+                    super().save(*args, **kwargs)
+                    self._update_conversation(adding)
+            except DatabaseError as e:
+                self.sequence = None
+                metrics.SEQUENCE_ALLOCATION_ERRORS.inc(error=type(e).__name__)
+                raise
+            finally:
+                metrics.SEQUENCE_ALLOCATION_DURATION.observe(time.perf_counter() - start)
+        else:
             with transaction.atomic():
-                last = (
-                    Message.objects.select_for_update()
-                    .filter(conversation=self.conversation)
-                    .order_by("-sequence")
-                    .first()
-                )
-                self.sequence = 1 if last is None else last.sequence + 1
                 super().save(*args, **kwargs)
-        else:
-            super().save(*args, **kwargs)
-        Conversation.objects.filter(pk=self.conversation_id).update(updated_at=timezone.now())
+                self._update_conversation(adding)
+
+    def _update_conversation(self, adding: bool) -> None:
+        """Bump the conversation's activity time and, for new messages, its denormalized counters."""
+        changes = {"updated_at": timezone.now()}
+        if adding:
+            changes.update(
+                message_count=F("message_count") + 1,
+                last_message_at=self.created_at,
+                last_message_preview=self.text[: Conversation.PREVIEW_LENGTH],
+            )
+        Conversation.objects.filter(pk=self.conversation_id).update(**changes)
 
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.conversation_id}#{self.sequence}:{self.role}"
 
 
+class ConversationArchive(models.Model):
+    """Cold storage for an idle conversation's messages and message feedback, as one compressed blob."""
+
+    conversation = models.OneToOneField(Conversation, related_name="archive", on_delete=models.CASCADE)
+    payload = models.BinaryField()
+    message_count = models.PositiveIntegerField()
+    raw_size = models.PositiveIntegerField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Archive of {self.conversation_id} ({self.message_count} messages)"
+
+
 class MessageFeedback(models.Model):
     RATING_CHOICES = (
         (1, "Very Poor"),
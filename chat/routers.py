@@ -0,0 +1,65 @@
+"""
+Database routing for read replicas
+
+Reads go to ``settings.DATABASE_READ_ALIAS`` (a replica or read-only SQLite
+snapshot) and writes always go to ``default``. Once a request writes, or when a
+client wrote within the last DATABASE_READ_STICKY_SECONDS (tracked by
+ReadReplicaPinningMiddleware with a cookie), reads are pinned to ``default`` so
+a client always sees its own writes.
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+_pinned: ContextVar[bool] = ContextVar("chat_db_pinned", default=False)
+_wrote: ContextVar[bool] = ContextVar("chat_db_wrote", default=False)
+
+
+def start_request(pinned: bool = False) -> None:
+    """Reset routing state at the start of a request."""
+    _pinned.set(pinned)
+    _wrote.set(False)
+
+
+def pin_to_primary() -> None:
+    _pinned.set(True)
+
+
+def is_pinned() -> bool:
+    return _pinned.get()
+
+
+def wrote() -> bool:
+    """Whether the current request sent a write to the primary."""
+    return _wrote.get()
+
+
+def read_alias() -> str:
+    alias = getattr(settings, "DATABASE_READ_ALIAS", DEFAULT_DB_ALIAS)
+    if alias not in settings.DATABASES:
+        return DEFAULT_DB_ALIAS
+    return alias
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _pinned.get():
+            return DEFAULT_DB_ALIAS
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        _pinned.set(True)
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every alias holds the same data, so relations across them are fine
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -1,12 +1,28 @@
 from rest_framework import serializers
 
 from .models import Conversation, Message, MessageFeedback, ConversationFeedback
+from .utils.instrumentation import timed
 
 
-class ConversationSerializer(serializers.ModelSerializer):
+class TimedSerializerMixin:
+    """Attribute time spent building ``.data`` to the request's serialize phase"""
+
+    @property
+    def data(self):
+        with timed("serialize"):
+            return super().data
+
+
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    pass
+
+
+class ConversationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Conversation
-        fields = ["id", "title", "created_at", "updated_at"]
+        fields = ["id", "title", "created_at", "updated_at", "message_count", "last_message_at", "last_message_preview"]
+        read_only_fields = ["message_count", "last_message_at", "last_message_preview"]
+        list_serializer_class = TimedListSerializer
 
 
 class MessageFeedbackNestedSerializer(serializers.ModelSerializer):
@@ -17,13 +33,14 @@ class MessageFeedbackNestedSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at"]
 
 
-class MessageSerializer(serializers.ModelSerializer):
+class MessageSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     feedback = MessageFeedbackNestedSerializer(read_only=True, required=False, allow_null=True)
     
     class Meta:
         model = Message
         fields = ["id", "conversation", "role", "text", "created_at", "sequence", "feedback"]
         read_only_fields = ["id", "created_at", "sequence", "conversation", "role", "feedback"]
+        list_serializer_class = TimedListSerializer
 
 
 class CreateMessageSerializer(serializers.Serializer):
@@ -36,7 +53,7 @@ class CreateMessageSerializer(serializers.Serializer):
         return text
 
 
-class MessageFeedbackSerializer(serializers.ModelSerializer):
+class MessageFeedbackSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     conversation_id = serializers.IntegerField(source='message.conversation.id', read_only=True)
     conversation_title = serializers.CharField(source='message.conversation.title', read_only=True)
     
@@ -44,6 +61,7 @@ class MessageFeedbackSerializer(serializers.ModelSerializer):
         model = MessageFeedback
         fields = ["id", "message", "conversation_id", "conversation_title", "rating", "comment", "created_at", "updated_at"]
         read_only_fields = ["id", "message", "created_at", "updated_at"]
+        list_serializer_class = TimedListSerializer
 
     def validate_rating(self, value: int) -> int:
         if not 1 <= value <= 5:
@@ -51,13 +69,14 @@ class MessageFeedbackSerializer(serializers.ModelSerializer):
         return value
 
 
-class ConversationFeedbackSerializer(serializers.ModelSerializer):
+class ConversationFeedbackSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     conversation_title = serializers.CharField(source='conversation.title', read_only=True)
     
     class Meta:
         model = ConversationFeedback
         fields = ["id", "conversation", "conversation_title", "overall_rating", "helpfulness_rating", "accuracy_rating", "comment", "created_at", "updated_at"]
         read_only_fields = ["id", "conversation", "created_at", "updated_at"]
+        list_serializer_class = TimedListSerializer
 
     def validate_overall_rating(self, value: int) -> int:
         if not 1 <= value <= 5:
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import os
+import time
 from typing import List, Dict
 
+from ..utils import metrics
+from ..utils.instrumentation import timed
+
 
 class GeminiServiceError(RuntimeError):
     pass
@@ -12,6 +16,12 @@ def _get_model_name() -> str:
     return os.environ.get("GEMINI_MODEL", "gemini-2.5-flash")
 
 
+def _error_class(exc: BaseException) -> str:
+    """Name of the underlying exception class, for error metrics."""
+    cause = exc.__cause__ or exc
+    return type(cause).__name__
+
+
 def generate_reply(history: List[Dict[str, str]], prompt: str, timeout_s: int = 10) -> str:
     """
     Minimal wrapper around google-generativeai.
@@ -19,6 +29,19 @@ def generate_reply(history: List[Dict[str, str]], prompt: str, timeout_s: int =
     - prompt: the latest user input
     Returns plain text reply or raises GeminiServiceError on failure.
     """
+    start = time.perf_counter()
+    outcome = "success"
+    try:
+        return _generate_reply(history, prompt, timeout_s)
+    except GeminiServiceError as e:
+        outcome = "error"
+        metrics.LLM_ERRORS.inc(operation="reply", error=_error_class(e))
+        raise
+    finally:
+        metrics.LLM_REQUEST_DURATION.observe(time.perf_counter() - start, operation="reply", outcome=outcome)
+
+
+def _generate_reply(history: List[Dict[str, str]], prompt: str, timeout_s: int) -> str:
     api_key = os.environ.get("GEMINI_API_KEY")
     if not api_key:
         raise GeminiServiceError("Gemini API key is missing; set GEMINI_API_KEY in .env")
@@ -26,7 +49,7 @@ def generate_reply(history: List[Dict[str, str]], prompt: str, timeout_s: int =
     try:
         import google.generativeai as genai
     except Exception as e:  # pragma: no cover - import error path
-        raise GeminiServiceError(f"Gemini client not available: {e}")
+        raise GeminiServiceError(f"Gemini client not available: {e}") from e
 
     genai.configure(api_key=api_key)
     model_name = _get_model_name()
@@ -46,12 +69,13 @@ def generate_reply(history: List[Dict[str, str]], prompt: str, timeout_s: int =
         messages.append({"role": "user", "parts": [prompt]})
 
         # Synchronous call
-        resp = model.generate_content(messages, request_options={"timeout": timeout_s})
+        with timed("llm"):
+            resp = model.generate_content(messages, request_options={"timeout": timeout_s})
         text = getattr(resp, "text", None) or ""
         text = text.strip()
         if not text:
             raise GeminiServiceError("Empty response from Gemini")
         return text
     except Exception as e:
-        raise GeminiServiceError(f"Gemini request failed: {e}")
+        raise GeminiServiceError(f"Gemini request failed: {e}") from e
 
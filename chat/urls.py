@@ -12,5 +12,8 @@ urlpatterns = [
     path("feedback/insights/", views.FeedbackInsightsView.as_view(), name="feedback-insights"),
     path("conversations/generate-title/", views.generate_conversation_title, name="generate-title"),
     path("insights/", views.insights_view, name="insights"),
+    path("export/", views.ExportView.as_view(), name="export"),
+    path("import/", views.ImportView.as_view(), name="import"),
+    path("debug/requests/", views.RequestInstrumentationView.as_view(), name="debug-requests"),
 ]
 
@@ -0,0 +1,200 @@
+"""
+Cold storage for idle conversations
+
+Conversations with no activity for ``CHAT_ARCHIVE_IDLE_DAYS`` have their
+messages and message feedback serialized to JSON, compressed (see
+``chat.utils.compression``) into a single ``ConversationArchive`` row, and
+deleted from the hot tables. The ``Conversation`` row itself stays, with its
+denormalized counters and preview, so the conversation list is unaffected; only
+``archived_at`` is set.
+
+Opening an archived conversation through the detail or messages endpoints
+rehydrates it: messages and feedback are restored with their original ids,
+sequences and timestamps, and the archive row is removed. Neither step touches
+``updated_at``, so archiving never reorders the conversation list.
+
+Message feedback of archived conversations is not visible to the insights or
+message feedback endpoints until the conversation is rehydrated.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import compression, metrics
+from .. import routers
+from .bulk_import import restore_timestamps
+from ..models import Conversation, ConversationArchive, Message, MessageFeedback
+
+
+PAYLOAD_VERSION = 1
+DEFAULT_BATCH_SIZE = 100  # conversations per transaction
+
+
+@dataclass
+class ArchiveResult:
+    conversations: int = 0
+    messages: int = 0
+    raw_bytes: int = 0
+    stored_bytes: int = 0
+
+
+def idle_conversations(idle_days: Optional[int] = None) -> QuerySet[Conversation]:
+    """Hot conversations whose last activity is older than ``idle_days``."""
+    if idle_days is None:
+        idle_days = settings.CHAT_ARCHIVE_IDLE_DAYS
+    cutoff = timezone.now() - timedelta(days=idle_days)
+    return Conversation.objects.filter(archived_at__isnull=True, updated_at__lt=cutoff, message_count__gt=0)
+
+
+def _json_default(value: Any) -> str:
+    # Full-precision isoformat; DjangoJSONEncoder would truncate to milliseconds
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _payload(conversation_id: int) -> Dict[str, Any]:
+    rows = (
+        Message.objects.filter(conversation_id=conversation_id)
+        .order_by("sequence")
+        .values(
+            "id", "sequence", "role", "text", "created_at",
+            "feedback__id", "feedback__rating", "feedback__comment",
+            "feedback__created_at", "feedback__updated_at",
+        )
+    )
+    messages = []
+    for row in rows:
+        feedback = None
+        if row["feedback__id"] is not None:
+            feedback = {
+                "id": row["feedback__id"],
+                "rating": row["feedback__rating"],
+                "comment": row["feedback__comment"],
+                "created_at": row["feedback__created_at"],
+                "updated_at": row["feedback__updated_at"],
+            }
+        messages.append({
+            "id": row["id"],
+            "sequence": row["sequence"],
+            "role": row["role"],
+            "text": row["text"],
+            "created_at": row["created_at"],
+            "feedback": feedback,
+        })
+    return {"version": PAYLOAD_VERSION, "messages": messages}
+
+
+def load_payload(blob: bytes) -> Dict[str, Any]:
+    """Decode an archive payload, turning timestamps back into datetimes."""
+    payload = json.loads(compression.decompress(blob))
+    for m in payload["messages"]:
+        m["created_at"] = parse_datetime(m["created_at"])
+        if m["feedback"]:
+            m["feedback"]["created_at"] = parse_datetime(m["feedback"]["created_at"])
+            m["feedback"]["updated_at"] = parse_datetime(m["feedback"]["updated_at"])
+    return payload
+
+
+def archive_conversations(conversation_ids: Iterable[int], result: Optional[ArchiveResult] = None) -> ArchiveResult:
+    """Move the given conversations to cold storage in one transaction."""
+    result = result or ArchiveResult()
+    now = timezone.now()
+    routers.pin_to_primary()
+    with transaction.atomic():
+        ids = list(
+            Conversation.objects.select_for_update()
+            .filter(pk__in=list(conversation_ids), archived_at__isnull=True)
+            .values_list("pk", flat=True)
+        )
+        archives = []
+        for conversation_id in ids:
+            payload = _payload(conversation_id)
+            raw = json.dumps(payload, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            blob = compression.compress(raw)
+            archives.append(ConversationArchive(
+                conversation_id=conversation_id,
+                payload=blob,
+                message_count=len(payload["messages"]),
+                raw_size=len(raw),
+            ))
+            result.messages += len(payload["messages"])
+            result.raw_bytes += len(raw)
+            result.stored_bytes += len(blob)
+        ConversationArchive.objects.bulk_create(archives)
+        # Feedback goes with its messages through the cascade
+        Message.objects.filter(conversation_id__in=ids).delete()
+        Conversation.objects.filter(pk__in=ids).update(archived_at=now)
+    result.conversations += len(ids)
+    metrics.ARCHIVE_OPERATIONS.inc(len(ids), operation="archive")
+    return result
+
+
+def archive_idle(
+    idle_days: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    limit: Optional[int] = None,
+) -> ArchiveResult:
+    """Archive every conversation idle for longer than ``idle_days``, ``batch_size`` per transaction."""
+    result = ArchiveResult()
+    candidates = idle_conversations(idle_days).order_by("pk").values_list("pk", flat=True)
+    if limit is not None:
+        candidates = candidates[:limit]
+    batch: List[int] = []
+    for conversation_id in candidates.iterator(chunk_size=batch_size):
+        batch.append(conversation_id)
+        if len(batch) >= batch_size:
+            archive_conversations(batch, result)
+            batch = []
+    if batch:
+        archive_conversations(batch, result)
+    return result
+
+
+def rehydrate(conversation: Conversation) -> bool:
+    """
+    Restore an archived conversation's messages to the hot tables.
+
+    Returns False when the conversation was not archived (or another request
+    rehydrated it first).
+    """
+    if conversation.archived_at is None:
+        return False
+    routers.pin_to_primary()
+    with transaction.atomic():
+        archive = ConversationArchive.objects.select_for_update().filter(conversation_id=conversation.pk).first()
+        if archive is None:
+            conversation.archived_at = None
+            return False
+        messages = []
+        message_times = []
+        feedback = []
+        feedback_times = []
+        for m in load_payload(archive.payload)["messages"]:
+            messages.append(Message(
+                id=m["id"], conversation_id=conversation.pk, sequence=m["sequence"], role=m["role"], text=m["text"],
+            ))
+            message_times.append({"created_at": m["created_at"]})
+            fb = m["feedback"]
+            if fb:
+                feedback.append(MessageFeedback(id=fb["id"], message_id=m["id"], rating=fb["rating"], comment=fb["comment"]))
+                feedback_times.append({"created_at": fb["created_at"], "updated_at": fb["updated_at"]})
+        Message.objects.bulk_create(messages)
+        restore_timestamps(Message, messages, message_times)
+        MessageFeedback.objects.bulk_create(feedback)
+        restore_timestamps(MessageFeedback, feedback, feedback_times)
+        archive.delete()
+        Conversation.objects.filter(pk=conversation.pk).update(archived_at=None)
+    conversation.archived_at = None
+    metrics.ARCHIVE_OPERATIONS.inc(operation="rehydrate")
+    return True
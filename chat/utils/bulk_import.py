@@ -0,0 +1,263 @@
+"""
+Bulk import of historical conversation transcripts
+
+Input is NDJSON with one conversation per line::
+
+    {"title": "Pasta", "created_at": "2024-01-02T10:00:00Z",
+     "messages": [
+        {"role": "user", "text": "How do I cook pasta?", "created_at": "..."},
+        {"role": "ai", "text": "Boil water...", "feedback": {"rating": 5, "comment": "Great"}}
+     ],
+     "feedback": {"overall_rating": 5, "helpfulness_rating": 5, "accuracy_rating": 4}}
+
+Transcripts are buffered into batches. Each batch is written in one transaction
+with ``bulk_create``: sequences are assigned in memory (1..n per conversation),
+denormalized counters are filled in up front, and no AI reply or title is
+generated. Timestamps given in the transcript are restored afterwards with
+keyed UPDATEs, since ``auto_now_add`` fields ignore them on insert.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import ChatCounter, Conversation, ConversationFeedback, Message, MessageFeedback
+
+
+DEFAULT_BATCH_SIZE = 5000  # messages per transaction
+MAX_REPORTED_ERRORS = 100
+
+
+class TranscriptError(ValueError):
+    pass
+
+
+@dataclass
+class ImportResult:
+    conversations: int = 0
+    messages: int = 0
+    message_feedback: int = 0
+    conversation_feedback: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    error_count: int = 0
+
+    def add_error(self, line: int, error: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, error))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "conversations": self.conversations,
+            "messages": self.messages,
+            "message_feedback": self.message_feedback,
+            "conversation_feedback": self.conversation_feedback,
+            "error_count": self.error_count,
+            "errors": [{"line": line, "error": error} for line, error in self.errors],
+        }
+
+
+def _parse_timestamp(value: Any, name: str) -> Optional[datetime]:
+    if value in (None, ""):
+        return None
+    parsed = parse_datetime(value) if isinstance(value, str) else None
+    if parsed is None:
+        raise TranscriptError(f"{name} is not an ISO 8601 datetime")
+    if timezone.is_naive(parsed):
+        parsed = parsed.replace(tzinfo=dt_timezone.utc)
+    return parsed
+
+
+def _parse_rating(data: Dict[str, Any], key: str, prefix: str) -> int:
+    value = data.get(key)
+    if not isinstance(value, int) or isinstance(value, bool) or not 1 <= value <= 5:
+        raise TranscriptError(f"{prefix}{key} must be an integer between 1 and 5")
+    return value
+
+
+def parse_transcript(line: str | bytes) -> Dict[str, Any]:
+    """Validate one NDJSON line and normalise it into plain values."""
+    try:
+        data = json.loads(line)
+    except ValueError as e:
+        raise TranscriptError(f"invalid JSON: {e}")
+    if not isinstance(data, dict):
+        raise TranscriptError("transcript must be a JSON object")
+    raw_messages = data.get("messages") or []
+    if not isinstance(raw_messages, list):
+        raise TranscriptError("messages must be a list")
+
+    title = data.get("title")
+    if title is not None and (not isinstance(title, str) or len(title) > 200):
+        raise TranscriptError("title must be a string of at most 200 characters")
+
+    messages = []
+    for index, raw in enumerate(raw_messages):
+        if not isinstance(raw, dict):
+            raise TranscriptError(f"messages[{index}] must be an object")
+        role = raw.get("role")
+        if role not in (Message.ROLE_USER, Message.ROLE_AI):
+            raise TranscriptError(f"messages[{index}].role must be 'user' or 'ai'")
+        text = raw.get("text")
+        if not isinstance(text, str) or not text.strip():
+            raise TranscriptError(f"messages[{index}].text must be a non-empty string")
+        feedback = raw.get("feedback")
+        if feedback is not None:
+            if not isinstance(feedback, dict):
+                raise TranscriptError(f"messages[{index}].feedback must be an object")
+            feedback = {
+                "rating": _parse_rating(feedback, "rating", f"messages[{index}].feedback."),
+                "comment": feedback.get("comment"),
+                "created_at": _parse_timestamp(feedback.get("created_at"), "feedback.created_at"),
+            }
+        messages.append({
+            "role": role,
+            "text": text,
+            "created_at": _parse_timestamp(raw.get("created_at"), f"messages[{index}].created_at"),
+            "feedback": feedback,
+        })
+
+    feedback = data.get("feedback")
+    if feedback is not None:
+        if not isinstance(feedback, dict):
+            raise TranscriptError("feedback must be an object")
+        feedback = {
+            "overall_rating": _parse_rating(feedback, "overall_rating", "feedback."),
+            "helpfulness_rating": _parse_rating(feedback, "helpfulness_rating", "feedback."),
+            "accuracy_rating": _parse_rating(feedback, "accuracy_rating", "feedback."),
+            "comment": feedback.get("comment"),
+            "created_at": _parse_timestamp(feedback.get("created_at"), "feedback.created_at"),
+        }
+
+    return {
+        "title": title,
+        "created_at": _parse_timestamp(data.get("created_at"), "created_at"),
+        "updated_at": _parse_timestamp(data.get("updated_at"), "updated_at"),
+        "messages": messages,
+        "feedback": feedback,
+    }
+
+
+def restore_timestamps(model, objs: List[Any], wanted: List[Dict[str, Optional[datetime]]]) -> None:
+    """
+    Overwrite auto_now/auto_now_add values with the transcript's own timestamps.
+
+    Uses a primary-key UPDATE per row through ``executemany`` rather than
+    ``bulk_update``, whose CASE WHEN statements dominate import time.
+    """
+    by_fields: Dict[Tuple[str, ...], List[List[Any]]] = {}
+    for obj, values in zip(objs, wanted):
+        present = tuple(sorted(name for name, value in values.items() if value is not None))
+        if not present:
+            continue
+        for name in present:
+            setattr(obj, name, values[name])
+        by_fields.setdefault(present, []).append(
+            [connection.ops.adapt_datetimefield_value(values[name]) for name in present] + [obj.pk]
+        )
+    if not by_fields:
+        return
+    qn = connection.ops.quote_name
+    table = qn(model._meta.db_table)
+    pk = qn(model._meta.pk.column)
+    with connection.cursor() as cursor:
+        for names, params in by_fields.items():
+            assignments = ", ".join(f"{qn(model._meta.get_field(name).column)} = %s" for name in names)
+            cursor.executemany(f"UPDATE {table} SET {assignments} WHERE {pk} = %s", params)
+
+
+def _write_batch(transcripts: List[Dict[str, Any]], result: ImportResult) -> None:
+    with transaction.atomic():
+        conversations = []
+        for t in transcripts:
+            last = t["messages"][-1] if t["messages"] else None
+            conversations.append(Conversation(
+                title=t["title"],
+                message_count=len(t["messages"]),
+                last_message_preview=last["text"][: Conversation.PREVIEW_LENGTH] if last else "",
+            ))
+        Conversation.objects.bulk_create(conversations)
+
+        messages = []
+        message_sources = []
+        for conv, t in zip(conversations, transcripts):
+            for sequence, m in enumerate(t["messages"], start=1):
+                messages.append(Message(conversation_id=conv.pk, role=m["role"], text=m["text"], sequence=sequence))
+                message_sources.append(m)
+        Message.objects.bulk_create(messages)
+        restore_timestamps(Message, messages, [{"created_at": m["created_at"]} for m in message_sources])
+
+        # Messages are in conversation order, so the last one seen per conversation wins
+        last_message_at: Dict[int, datetime] = {}
+        for msg in messages:
+            last_message_at[msg.conversation_id] = msg.created_at
+        restore_timestamps(Conversation, conversations, [
+            {
+                "created_at": t["created_at"],
+                "updated_at": t["updated_at"] or last_message_at.get(conv.pk) or t["created_at"],
+                "last_message_at": last_message_at.get(conv.pk),
+            }
+            for conv, t in zip(conversations, transcripts)
+        ])
+
+        message_feedback = []
+        message_feedback_times = []
+        for msg, m in zip(messages, message_sources):
+            if m["feedback"]:
+                message_feedback.append(MessageFeedback(message_id=msg.pk, rating=m["feedback"]["rating"], comment=m["feedback"]["comment"]))
+                message_feedback_times.append({"created_at": m["feedback"]["created_at"]})
+        MessageFeedback.objects.bulk_create(message_feedback)
+        restore_timestamps(MessageFeedback, message_feedback, message_feedback_times)
+
+        conversation_feedback = []
+        conversation_feedback_times = []
+        for conv, t in zip(conversations, transcripts):
+            fb = t["feedback"]
+            if fb:
+                conversation_feedback.append(ConversationFeedback(
+                    conversation_id=conv.pk,
+                    overall_rating=fb["overall_rating"],
+                    helpfulness_rating=fb["helpfulness_rating"],
+                    accuracy_rating=fb["accuracy_rating"],
+                    comment=fb["comment"],
+                ))
+                conversation_feedback_times.append({"created_at": fb["created_at"]})
+        ConversationFeedback.objects.bulk_create(conversation_feedback)
+        restore_timestamps(ConversationFeedback, conversation_feedback, conversation_feedback_times)
+
+        ChatCounter.add(ChatCounter.CONVERSATIONS, len(conversations))
+
+    result.conversations += len(conversations)
+    result.messages += len(messages)
+    result.message_feedback += len(message_feedback)
+    result.conversation_feedback += len(conversation_feedback)
+
+
+def import_transcripts(lines: Iterable[str | bytes], batch_size: int = DEFAULT_BATCH_SIZE) -> ImportResult:
+    """Import NDJSON transcripts, committing roughly ``batch_size`` messages per transaction."""
+    result = ImportResult()
+    batch: List[Dict[str, Any]] = []
+    pending_messages = 0
+    for lineno, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            transcript = parse_transcript(line)
+        except TranscriptError as e:
+            result.add_error(lineno, str(e))
+            continue
+        batch.append(transcript)
+        pending_messages += len(transcript["messages"]) or 1
+        if pending_messages >= batch_size:
+            _write_batch(batch, result)
+            batch, pending_messages = [], 0
+    if batch:
+        _write_batch(batch, result)
+    return result
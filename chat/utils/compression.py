@@ -0,0 +1,69 @@
+"""
+Self-describing compressed blobs
+
+Every blob starts with a one-byte codec tag so readers never need to know how a
+row was written: zstd (when the optional ``zstandard`` package is installed) or
+zlib from the standard library. ``CHAT_COMPRESSION_CODEC`` picks the codec for
+new blobs ("auto" prefers zstd); existing blobs stay readable whichever is set.
+"""
+
+from __future__ import annotations
+
+import zlib
+
+from django.conf import settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODEC_NAMES = {CODEC_ZLIB: "zlib", CODEC_ZSTD: "zstd"}
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+class CompressionError(ValueError):
+    pass
+
+
+def default_codec() -> int:
+    name = getattr(settings, "CHAT_COMPRESSION_CODEC", "auto")
+    if name == "zlib":
+        return CODEC_ZLIB
+    if name == "zstd":
+        if zstandard is None:
+            raise CompressionError("CHAT_COMPRESSION_CODEC is 'zstd' but the zstandard package is not installed")
+        return CODEC_ZSTD
+    return CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+
+
+def compress(data: bytes, codec: int | None = None) -> bytes:
+    codec = default_codec() if codec is None else codec
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise CompressionError("zstandard package is not installed")
+        body = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    elif codec == CODEC_ZLIB:
+        body = zlib.compress(data, ZLIB_LEVEL)
+    else:
+        raise CompressionError(f"unknown codec {codec}")
+    return bytes((codec,)) + body
+
+
+def decompress(blob: bytes) -> bytes:
+    blob = bytes(blob)  # BinaryField values may come back as memoryview
+    if not blob:
+        raise CompressionError("empty blob")
+    codec, body = blob[0], blob[1:]
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(body)
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise CompressionError("blob is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(body)
+    raise CompressionError(f"unknown codec {codec}")
@@ -0,0 +1,165 @@
+"""
+Streaming NDJSON export of conversations, messages and feedback
+
+The export walks two server-side iterators in step: conversations ordered by id
+(with their feedback joined in) and messages ordered by (conversation, sequence)
+(with their feedback joined in). Only one chunk of each is held in memory, so
+memory use stays flat however large the database is. Each output line is one
+record with a ``type`` of ``conversation``, ``conversation_feedback``,
+``message`` or ``message_feedback``.
+
+Archived conversations (see ``chat.utils.archive``) are exported too: a third
+iterator walks ``ConversationArchive`` rows in the same order and their
+messages are decompressed one conversation at a time.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Dict, Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .archive import load_payload
+from ..models import Conversation, ConversationArchive, Message
+
+
+DEFAULT_CHUNK_SIZE = 2000
+# Lines are joined into blocks of roughly this many bytes before being yielded
+OUTPUT_BLOCK_SIZE = 64 * 1024
+
+
+def iter_export_records(chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Yield export records in conversation order, each followed by its messages."""
+    conversations = (
+        Conversation.objects.order_by("id")
+        .values(
+            "id", "title", "created_at", "updated_at",
+            "feedback__id", "feedback__overall_rating", "feedback__helpfulness_rating",
+            "feedback__accuracy_rating", "feedback__comment", "feedback__created_at",
+            "feedback__updated_at",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+    messages = (
+        Message.objects.order_by("conversation_id", "sequence")
+        .values(
+            "id", "conversation_id", "sequence", "role", "text", "created_at",
+            "feedback__id", "feedback__rating", "feedback__comment", "feedback__created_at",
+            "feedback__updated_at",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+
+    archives = (
+        ConversationArchive.objects.order_by("conversation_id")
+        .values_list("conversation_id", "payload")
+        .iterator(chunk_size=max(1, chunk_size // 100))
+    )
+
+    pending = next(messages, None)
+    pending_archive = next(archives, None)
+    for conv in conversations:
+        yield {
+            "type": "conversation",
+            "id": conv["id"],
+            "title": conv["title"],
+            "created_at": conv["created_at"],
+            "updated_at": conv["updated_at"],
+        }
+        if conv["feedback__id"] is not None:
+            yield {
+                "type": "conversation_feedback",
+                "id": conv["feedback__id"],
+                "conversation_id": conv["id"],
+                "overall_rating": conv["feedback__overall_rating"],
+                "helpfulness_rating": conv["feedback__helpfulness_rating"],
+                "accuracy_rating": conv["feedback__accuracy_rating"],
+                "comment": conv["feedback__comment"],
+                "created_at": conv["feedback__created_at"],
+                "updated_at": conv["feedback__updated_at"],
+            }
+        # Messages of conversations deleted mid-export (id < conv id) are skipped
+        while pending is not None and pending["conversation_id"] <= conv["id"]:
+            if pending["conversation_id"] == conv["id"]:
+                yield from _message_records(pending)
+            archives = (
+        ConversationArchive.objects.order_by("conversation_id")
+        .values_list("conversation_id", "payload")
+        .iterator(chunk_size=max(1, chunk_size // 100))
+    )
+
+    pending = next(messages, None)
+    pending_archive = next(archives, None)
+
+
+def _message_records(row: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield {
+        "type": "message",
+        "id": row["id"],
+        "conversation_id": row["conversation_id"],
+        "sequence": row["sequence"],
+        "role": row["role"],
+        "text": row["text"],
+        "created_at": row["created_at"],
+    }
+    if row["feedback__id"] is not None:
+        yield {
+            "type": "message_feedback",
+            "id": row["feedback__id"],
+            "message_id": row["id"],
+            "rating": row["feedback__rating"],
+            "comment": row["feedback__comment"],
+            "created_at": row["feedback__created_at"],
+            "updated_at": row["feedback__updated_at"],
+        }
+
+
+def _archived_message_records(conversation_id: int, m: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    feedback = m["feedback"] or {}
+    yield from _message_records({
+        "id": m["id"],
+        "conversation_id": conversation_id,
+        "sequence": m["sequence"],
+        "role": m["role"],
+        "text": m["text"],
+        "created_at": m["created_at"],
+        "feedback__id": feedback.get("id"),
+        "feedback__rating": feedback.get("rating"),
+        "feedback__comment": feedback.get("comment"),
+        "feedback__created_at": feedback.get("created_at"),
+        "feedback__updated_at": feedback.get("updated_at"),
+    })
+
+
+def iter_ndjson(records: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """Encode records as NDJSON, yielding blocks of about OUTPUT_BLOCK_SIZE bytes."""
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    block: list = []
+    size = 0
+    for record in records:
+        line = (encoder.encode(record) + "\n").encode("utf-8")
+        block.append(line)
+        size += len(line)
+        if size >= OUTPUT_BLOCK_SIZE:
+            yield b"".join(block)
+            block, size = [], 0
+    if block:
+        yield b"".join(block)
+
+
+def iter_gzip(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip a byte stream incrementally."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_export(chunk_size: int = DEFAULT_CHUNK_SIZE, gzip: bool = False) -> Iterator[bytes]:
+    """The complete export as a stream of NDJSON (optionally gzipped) bytes."""
+    stream = iter_ndjson(iter_export_records(chunk_size=chunk_size))
+    return iter_gzip(stream) if gzip else stream
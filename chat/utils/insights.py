@@ -10,6 +10,7 @@ from datetime import timedelta
 from typing import Dict, Any, Tuple
 
 from ..models import MessageFeedback, ConversationFeedback
+from . import metrics
 
 
 def get_message_feedback_stats(since_date: timezone.datetime) -> Dict[str, Any]:
@@ -61,9 +62,10 @@ def get_insights_data(days: int = 30) -> Dict[str, Any]:
     """Get complete insights data for a given number of days"""
     since_date = timezone.now() - timedelta(days=days)
     
-    message_stats = get_message_feedback_stats(since_date)
-    conversation_stats = get_conversation_feedback_stats(since_date)
-    recent_message_feedback, recent_conversation_feedback = get_recent_feedback(since_date)
+    with metrics.INSIGHTS_DURATION.time():
+        message_stats = get_message_feedback_stats(since_date)
+        conversation_stats = get_conversation_feedback_stats(since_date)
+        recent_message_feedback, recent_conversation_feedback = get_recent_feedback(since_date)
     
     return {
         'period_days': days,
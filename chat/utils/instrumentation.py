@@ -0,0 +1,108 @@
+"""
+Per-request instrumentation helpers
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+
+class RequestTimings:
+    """Accumulates the time spent in each phase of a single request."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._active: set = set()
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.durations[phase] = self.durations.get(phase, 0.0) + seconds
+        self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("chat_request_timings", default=None)
+
+_buffer_lock = threading.Lock()
+_buffer: Deque[Dict[str, Any]] = deque(maxlen=200)
+
+
+def start_request() -> RequestTimings:
+    """Begin collecting timings for the current request context."""
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+def finish_request() -> None:
+    _current.set(None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Record the time spent inside the block against ``phase``.
+
+    Nested blocks for the same phase are only counted once, so wrapping both a
+    list serializer and its children does not double count. Outside of an
+    instrumented request this is a no-op.
+    """
+    timings = _current.get()
+    if timings is None or phase in timings._active:
+        yield
+        return
+    timings._active.add(phase)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings._active.discard(phase)
+        timings.add(phase, time.perf_counter() - start)
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    """``connection.execute_wrapper`` hook that times every database query."""
+    with timed("db"):
+        return execute(sql, params, many, context)
+
+
+def server_timing_header(timings: RequestTimings, total: float) -> str:
+    """Format the collected timings as a ``Server-Timing`` header value."""
+    parts = []
+    for phase in sorted(timings.durations):
+        count = timings.counts.get(phase, 0)
+        parts.append(f'{phase};dur={timings.durations[phase] * 1000:.2f};desc="{count} calls"')
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+def record(entry: Dict[str, Any], maxlen: int = 200) -> None:
+    """Append an entry to the in-process ring buffer of recent requests."""
+    global _buffer
+    with _buffer_lock:
+        if _buffer.maxlen != maxlen:
+            _buffer = deque(_buffer, maxlen=maxlen)
+        _buffer.append(entry)
+
+
+def recent_requests() -> List[Dict[str, Any]]:
+    """Return the buffered request records, newest first."""
+    with _buffer_lock:
+        return list(reversed(_buffer))
+
+
+def clear_recent_requests() -> None:
+    with _buffer_lock:
+        _buffer.clear()
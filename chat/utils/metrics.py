@@ -0,0 +1,272 @@
+"""
+Lightweight in-process metrics with Prometheus text exposition
+
+Counters and histograms are kept in plain dicts guarded by a lock, so recording a
+sample is a dict update. When CHAT_METRICS_DIR is set, every worker process
+periodically writes a snapshot of its own samples to that directory and the
+``/metrics`` endpoint sums the snapshots of all workers, so any worker can
+answer a scrape for the whole pool. Clear the directory when the pool starts.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+FLUSH_INTERVAL_S = 1.0
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.samples: Dict[LabelValues, object] = {}
+        REGISTRY.register(self)
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        key = self._key(labels)
+        with REGISTRY.lock:
+            REGISTRY.check_fork()
+            self.samples[key] = self.samples.get(key, 0.0) + amount
+        REGISTRY.touch()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with REGISTRY.lock:
+            REGISTRY.check_fork()
+            # Per-bucket (non-cumulative) counts, then sum and count
+            sample = self.samples.get(key)
+            if sample is None:
+                sample = self.samples[key] = [0] * len(self.buckets) + [0, 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    sample[i] += 1
+                    break
+            else:
+                sample[len(self.buckets)] += 1
+            sample[-2] += value
+            sample[-1] += 1
+        REGISTRY.touch()
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.metrics: Dict[str, _Metric] = {}
+        self._pid = os.getpid()
+        self._token = uuid.uuid4().hex[:8]
+        self._dirty = False
+        self._last_flush = 0.0
+
+    def register(self, metric: _Metric) -> None:
+        self.metrics[metric.name] = metric
+
+    def _directory(self) -> Optional[Path]:
+        directory = getattr(settings, "CHAT_METRICS_DIR", None)
+        return Path(directory) if directory else None
+
+    def check_fork(self) -> None:
+        # A forked worker inherits its parent's samples; start it from zero
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._token = uuid.uuid4().hex[:8]
+            for metric in self.metrics.values():
+                metric.samples = {}
+
+    def touch(self) -> None:
+        self._dirty = True
+        if time.monotonic() - self._last_flush >= FLUSH_INTERVAL_S:
+            self.flush()
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        with self.lock:
+            self.check_fork()
+            return {
+                name: {json.dumps(key): _copy(value) for key, value in metric.samples.items()}
+                for name, metric in self.metrics.items()
+            }
+
+    def flush(self) -> None:
+        """Write this process's samples to CHAT_METRICS_DIR, if configured."""
+        self._last_flush = time.monotonic()
+        directory = self._directory()
+        if directory is None or not self._dirty:
+            return
+        self._dirty = False
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"metrics-{self._pid}-{self._token}.json"
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.snapshot()))
+            os.replace(tmp, path)
+        except OSError:
+            self._dirty = True
+
+    def collect(self) -> Dict[str, Dict[str, object]]:
+        """Merge the samples of this process with those of every other worker."""
+        merged = self.snapshot()
+        directory = self._directory()
+        if directory is None or not directory.is_dir():
+            return merged
+        own = f"metrics-{self._pid}-{self._token}.json"
+        for path in directory.glob("metrics-*.json"):
+            if path.name == own:
+                continue
+            try:
+                other = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            for name, samples in other.items():
+                target = merged.setdefault(name, {})
+                for key, value in samples.items():
+                    target[key] = _add(target.get(key), value)
+        return merged
+
+    def exposition(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        merged = self.collect()
+        lines: List[str] = []
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for key, value in sorted(merged.get(name, {}).items()):
+                labels = list(zip(metric.labelnames, json.loads(key)))
+                if isinstance(metric, Histogram):
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets + (float("inf"),), value[:-2]):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else _format_value(bound)
+                        lines.append(f"{name}_bucket{_format_labels(labels + [('le', le)])} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value[-2])}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {value[-1]}")
+                else:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _copy(value: object) -> object:
+    return list(value) if isinstance(value, list) else value
+
+
+def _add(current: object, value: object) -> object:
+    if current is None:
+        return _copy(value)
+    if isinstance(current, list):
+        return [a + b for a, b in zip(current, value)]
+    return current + value
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: List[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if float(value).is_integer():
+        return f"{value:.1f}"
+    return repr(float(value))
+
+
+REGISTRY = Registry()
+atexit.register(REGISTRY.flush)
+
+
+HTTP_REQUEST_DURATION = Histogram(
+    "chat_http_request_duration_seconds",
+    "Request latency by view, method and status code.",
+    ["view", "method", "status"],
+)
+LLM_REQUEST_DURATION = Histogram(
+    "chat_llm_request_duration_seconds",
+    "Latency of outbound Gemini calls by operation and outcome.",
+    ["operation", "outcome"],
+)
+LLM_ERRORS = Counter(
+    "chat_llm_errors_total",
+    "Failed Gemini calls by operation and error class.",
+    ["operation", "error"],
+)
+TITLE_GENERATION = Counter(
+    "chat_title_generation_total",
+    "Conversation title requests by result (generated, fallback or error).",
+    ["result"],
+)
+MESSAGE_SIZE = Histogram(
+    "chat_message_size_chars",
+    "Size of stored messages in characters by role.",
+    ["role"],
+    buckets=(16, 64, 256, 1024, 4096, 16384, 65536),
+)
+SEQUENCE_ALLOCATION_DURATION = Histogram(
+    "chat_sequence_allocation_seconds",
+    "Time spent allocating a message sequence number, including lock waits.",
+)
+SEQUENCE_ALLOCATION_ERRORS = Counter(
+    "chat_sequence_allocation_errors_total",
+    "Sequence allocations that failed because of lock or uniqueness contention.",
+    ["error"],
+)
+INSIGHTS_DURATION = Histogram(
+    "chat_insights_duration_seconds",
+    "Time spent computing feedback insights.",
+)
+FEEDBACK_SUBMISSIONS = Counter(
+    "chat_feedback_submissions_total",
+    "Feedback writes by kind (message or conversation) and result (created or updated).",
+    ["kind", "result"],
+)
+ARCHIVE_OPERATIONS = Counter(
+    "chat_archive_operations_total",
+    "Conversations moved to (archive) or restored from (rehydrate) cold storage.",
+    ["operation"],
+)
@@ -4,10 +4,15 @@ Title generation utility functions
 
 from __future__ import annotations
 
+import time
+
 import requests
 from django.conf import settings
 from typing import Optional
 
+from . import metrics
+from .instrumentation import timed
+
 
 def generate_title_with_gemini(message: str) -> Optional[str]:
     """
@@ -22,6 +27,7 @@ def generate_title_with_gemini(message: str) -> Optional[str]:
     if not message:
         return None
     
+    start = time.perf_counter()
     try:
         prompt = f"""Analyze this user message and create a descriptive title (max 25 characters) that captures the main intent/topic:
 
@@ -51,7 +57,8 @@ Generate a descriptive title that captures the main intent (max 25 characters):"
         }
         params = {'key': settings.GEMINI_API_KEY}
         
-        response = requests.post(url, headers=headers, json=data, params=params, timeout=30)
+        with timed("llm"):
+            response = requests.post(url, headers=headers, json=data, params=params, timeout=30)
         response.raise_for_status()
         
         result = response.json()
@@ -64,9 +71,12 @@ Generate a descriptive title that captures the main intent (max 25 characters):"
         if len(title) > 25:
             title = title[:22] + '...'
         
+        metrics.LLM_REQUEST_DURATION.observe(time.perf_counter() - start, operation="title", outcome="success")
         return title
         
     except Exception as e:
+        metrics.LLM_REQUEST_DURATION.observe(time.perf_counter() - start, operation="title", outcome="error")
+        metrics.LLM_ERRORS.inc(operation="title", error=type(e).__name__)
         print(f"Gemini API failed: {e}")
         return None
 
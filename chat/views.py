@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any
 
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
 from django.shortcuts import get_object_or_404, render
 from django.db.models import QuerySet
 from django.conf import settings
@@ -11,7 +13,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Conversation, Message, MessageFeedback, ConversationFeedback
+from .models import ChatCounter, Conversation, Message, MessageFeedback, ConversationFeedback
 from .serializers import (
     ConversationSerializer,
     MessageSerializer,
@@ -20,6 +22,7 @@ from .serializers import (
     ConversationFeedbackSerializer,
 )
 from .services import gemini
+from .utils import archive, instrumentation, metrics
 
 
 class ConversationListCreateView(APIView):
@@ -35,7 +38,10 @@ class ConversationListCreateView(APIView):
             offset = 0
         items = qs[offset : offset + limit]
         data = ConversationSerializer(items, many=True).data
-        return Response({"results": data, "count": qs.count(), "offset": offset, "limit": limit})
+        count = ChatCounter.get_value(ChatCounter.CONVERSATIONS)
+        if count is None:
+            count = qs.count()
+        return Response({"results": data, "count": count, "offset": offset, "limit": limit})
 
     def post(self, request: Request) -> Response:
         title = (request.data or {}).get("title")
@@ -46,6 +52,7 @@ class ConversationListCreateView(APIView):
 class ConversationDetailView(APIView):
     def get(self, request: Request, pk: int) -> Response:
         conv = get_object_or_404(Conversation, pk=pk)
+        archive.rehydrate(conv)
         return Response(ConversationSerializer(conv).data)
 
     def patch(self, request: Request, pk: int) -> Response:
@@ -64,6 +71,7 @@ class ConversationDetailView(APIView):
 class MessageListCreateView(APIView):
     def get(self, request: Request, pk: int) -> Response:
         conv = get_object_or_404(Conversation, pk=pk)
+        archive.rehydrate(conv)
         try:
             since = int(request.query_params.get("since", 0))
         except ValueError:
@@ -84,6 +92,7 @@ class MessageListCreateView(APIView):
 
     def post(self, request: Request, pk: int) -> Response:
         conv = get_object_or_404(Conversation, pk=pk)
+        archive.rehydrate(conv)
         serializer = CreateMessageSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         text: str = serializer.validated_data["text"].strip()
@@ -118,11 +127,13 @@ class MessageFeedbackView(APIView):
             serializer = MessageFeedbackSerializer(feedback, data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
             serializer.save()
+            metrics.FEEDBACK_SUBMISSIONS.inc(kind="message", result="updated")
             return Response(serializer.data)
         except MessageFeedback.DoesNotExist:
             serializer = MessageFeedbackSerializer(data=request.data)
             serializer.is_valid(raise_exception=True)
             serializer.save(message=message)
+            metrics.FEEDBACK_SUBMISSIONS.inc(kind="message", result="created")
             return Response(serializer.data, status=status.HTTP_201_CREATED)
     
     def get(self, request: Request, message_id: int) -> Response:
@@ -144,11 +155,13 @@ class ConversationFeedbackView(APIView):
             serializer = ConversationFeedbackSerializer(feedback, data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
             serializer.save()
+            metrics.FEEDBACK_SUBMISSIONS.inc(kind="conversation", result="updated")
             return Response(serializer.data)
         except ConversationFeedback.DoesNotExist:
             serializer = ConversationFeedbackSerializer(data=request.data)
             serializer.is_valid(raise_exception=True)
             serializer.save(conversation=conversation)
+            metrics.FEEDBACK_SUBMISSIONS.inc(kind="conversation", result="created")
             return Response(serializer.data, status=status.HTTP_201_CREATED)
     
     def get(self, request: Request, conversation_id: int) -> Response:
@@ -183,6 +196,62 @@ class FeedbackInsightsView(APIView):
         })
 
 
+class ExportView(APIView):
+    """Stream every conversation, message and feedback row as NDJSON (``?compression=gzip`` to gzip)."""
+
+    def get(self, request: Request) -> StreamingHttpResponse:
+        from .utils.export import DEFAULT_CHUNK_SIZE, iter_export
+
+        gzip = request.query_params.get("compression") == "gzip"
+        try:
+            chunk_size = min(max(int(request.query_params.get("chunk_size", DEFAULT_CHUNK_SIZE)), 100), 10000)
+        except ValueError:
+            chunk_size = DEFAULT_CHUNK_SIZE
+        filename = f"chat-export-{timezone.now():%Y%m%d-%H%M%S}.ndjson" + (".gz" if gzip else "")
+        response = StreamingHttpResponse(
+            iter_export(chunk_size=chunk_size, gzip=gzip),
+            content_type="application/gzip" if gzip else "application/x-ndjson",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class ImportView(APIView):
+    """
+    Bulk import NDJSON transcripts (one conversation per line) without calling Gemini.
+
+    The body is read as a stream; send ``Content-Encoding: gzip`` for gzipped input.
+    """
+
+    def post(self, request: Request) -> Response:
+        import gzip
+        from .utils.bulk_import import DEFAULT_BATCH_SIZE, import_transcripts
+
+        try:
+            batch_size = min(max(int(request.query_params.get("batch_size", DEFAULT_BATCH_SIZE)), 100), 50000)
+        except ValueError:
+            batch_size = DEFAULT_BATCH_SIZE
+        stream = request._request
+        if request.headers.get("Content-Encoding", "").lower() == "gzip":
+            stream = gzip.GzipFile(fileobj=stream)
+        try:
+            result = import_transcripts(stream, batch_size=batch_size)
+        except (OSError, EOFError) as e:
+            return Response({"detail": f"Could not read request body: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        if result.error_count and not result.conversations:
+            return Response(result.as_dict(), status=status.HTTP_400_BAD_REQUEST)
+        return Response(result.as_dict(), status=status.HTTP_201_CREATED)
+
+
+class RequestInstrumentationView(APIView):
+    """Recent instrumented requests; only exposed when instrumentation is on and to DEBUG/staff."""
+
+    def get(self, request: Request) -> Response:
+        if not settings.CHAT_INSTRUMENTATION or not (settings.DEBUG or request.user.is_staff):
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"results": instrumentation.recent_requests()})
+
+
 @api_view(['POST'])
 def generate_conversation_title(request):
     """Generate a conversation title based on the first user message."""
@@ -197,13 +266,16 @@ def generate_conversation_title(request):
         title = generate_title_with_gemini(message)
         
         if title:
+            metrics.TITLE_GENERATION.inc(result="generated")
             return Response({'title': title})
         else:
             # Fallback to simple title
             title = generate_fallback_title(message)
+            metrics.TITLE_GENERATION.inc(result="fallback")
             return Response({'title': title})
         
     except Exception as e:
+        metrics.TITLE_GENERATION.inc(result="error")
         print(f"Error generating title: {e}")
         return Response({'error': f'Failed to generate title: {str(e)}'}, status=500)
 
@@ -211,3 +283,13 @@ def generate_conversation_title(request):
 def insights_view(request):
     """Simple view to serve the insights dashboard page."""
     return render(request, 'insights.html')
+
+
+def metrics_view(request):
+    """Expose metrics in the Prometheus text exposition format."""
+    if not settings.CHAT_METRICS:
+        return HttpResponse(status=404)
+    return HttpResponse(
+        metrics.REGISTRY.exposition(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
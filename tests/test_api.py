@@ -64,6 +64,24 @@ class TestConversationAPI:
         assert len(data["results"]) == 2
         assert data["count"] == 5
     
+    def test_list_conversations_rich_rows(self, client, django_assert_num_queries):
+        """Test that list rows carry counts and previews without extra queries"""
+        conv = Conversation.objects.create(title="Busy")
+        Message.objects.create(conversation=conv, role=Message.ROLE_USER, text="Hi")
+        Message.objects.create(conversation=conv, role=Message.ROLE_AI, text="Hello there")
+        for i in range(3):
+            Conversation.objects.create(title=f"Chat {i}")
+        
+        with django_assert_num_queries(2):
+            resp = client.get("/api/conversations/")
+        
+        data = resp.json()
+        assert data["count"] == 4
+        row = next(r for r in data["results"] if r["id"] == conv.id)
+        assert row["message_count"] == 2
+        assert row["last_message_preview"] == "Hello there"
+        assert row["last_message_at"] is not None
+    
     def test_get_conversation_detail(self, client):
         """Test getting a single conversation"""
         conv = Conversation.objects.create(title="Test Chat")
@@ -405,3 +423,189 @@ class TestInsightsAPI:
         assert resp.status_code == 200
         data = resp.json()
         assert data["period_days"] == 7
+
+
+@pytest.mark.django_db
+class TestMetricsAPI:
+    """Tests for the metrics endpoint"""
+    
+    def test_metrics_endpoint(self, client):
+        """Test that request latency is exposed per view"""
+        client.get("/api/conversations/")
+        resp = client.get("/metrics")
+        
+        assert resp.status_code == 200
+        assert resp["Content-Type"].startswith("text/plain; version=0.0.4")
+        body = resp.content.decode()
+        assert 'view="conversation-list-create"' in body
+        assert "# TYPE chat_llm_request_duration_seconds histogram" in body
+    
+    def test_title_generation_fallback_counted(self, client):
+        """Test that title fallbacks are counted"""
+        with patch("chat.utils.title_generation.generate_title_with_gemini", return_value=None):
+            resp = client.post(
+                "/api/conversations/generate-title/",
+                data=json.dumps({"message": "Hello world again"}),
+                content_type="application/json",
+            )
+        
+        assert resp.status_code == 200
+        body = client.get("/metrics").content.decode()
+        assert 'chat_title_generation_total{result="fallback"}' in body
+    
+    def test_metrics_disabled(self, client, settings):
+        """Test that the endpoint 404s when metrics are disabled"""
+        settings.CHAT_METRICS = False
+        resp = client.get("/metrics")
+        
+        assert resp.status_code == 404
+
+
+@pytest.mark.django_db
+class TestExportAPI:
+    """Tests for the streaming export endpoint"""
+    
+    def _seed(self):
+        conv = Conversation.objects.create(title="Export me")
+        user = Message.objects.create(conversation=conv, role=Message.ROLE_USER, text="Hi")
+        ai = Message.objects.create(conversation=conv, role=Message.ROLE_AI, text="Héllo")
+        MessageFeedback.objects.create(message=ai, rating=4)
+        ConversationFeedback.objects.create(
+            conversation=conv, overall_rating=5, helpfulness_rating=4, accuracy_rating=3
+        )
+        return conv, user, ai
+    
+    def test_export_ndjson(self, client):
+        """Test that the export streams one record per line"""
+        conv, user, ai = self._seed()
+        resp = client.get("/api/export/")
+        
+        assert resp.status_code == 200
+        assert resp["Content-Type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in b"".join(resp.streaming_content).decode().splitlines()]
+        assert [r["type"] for r in lines] == [
+            "conversation", "conversation_feedback", "message", "message", "message_feedback"
+        ]
+        assert lines[3]["text"] == "Héllo"
+        assert lines[4]["message_id"] == ai.id
+    
+    def test_export_gzip(self, client):
+        """Test that the export can be gzipped"""
+        import gzip
+        self._seed()
+        resp = client.get("/api/export/?compression=gzip")
+        
+        assert resp["Content-Type"] == "application/gzip"
+        body = gzip.decompress(b"".join(resp.streaming_content)).decode()
+        assert len(body.splitlines()) == 5
+
+
+@pytest.mark.django_db
+class TestImportAPI:
+    """Tests for the bulk import endpoint"""
+    
+    def test_import_transcripts(self, client):
+        """Test importing transcripts without calling Gemini"""
+        body = "\n".join([
+            json.dumps({
+                "title": "Pasta",
+                "created_at": "2024-01-02T10:00:00Z",
+                "messages": [
+                    {"role": "user", "text": "How do I cook pasta?", "created_at": "2024-01-02T10:00:00Z"},
+                    {"role": "ai", "text": "Boil water.", "created_at": "2024-01-02T10:00:05Z",
+                     "feedback": {"rating": 5, "comment": "Great"}},
+                ],
+                "feedback": {"overall_rating": 4, "helpfulness_rating": 5, "accuracy_rating": 3},
+            }),
+            "not json",
+            json.dumps({"messages": [{"role": "user", "text": "Hi"}]}),
+        ])
+        with patch.object(gemini, "generate_reply", side_effect=AssertionError("no AI calls")):
+            resp = client.post("/api/import/", data=body, content_type="application/x-ndjson")
+        
+        assert resp.status_code == 201
+        data = resp.json()
+        assert data["conversations"] == 2
+        assert data["messages"] == 3
+        assert data["message_feedback"] == 1
+        assert data["conversation_feedback"] == 1
+        assert data["errors"][0]["line"] == 2
+        
+        conv = Conversation.objects.get(title="Pasta")
+        assert conv.created_at.isoformat() == "2024-01-02T10:00:00+00:00"
+        assert conv.message_count == 2
+        assert conv.last_message_preview == "Boil water."
+        assert list(conv.messages.values_list("sequence", flat=True)) == [1, 2]
+        assert conv.messages.get(sequence=2).feedback.rating == 5
+    
+    def test_import_gzip(self, client):
+        """Test importing a gzipped body"""
+        import gzip
+        body = gzip.compress(json.dumps({"title": "Zipped", "messages": []}).encode())
+        resp = client.post(
+            "/api/import/", data=body, content_type="application/x-ndjson", HTTP_CONTENT_ENCODING="gzip"
+        )
+        
+        assert resp.status_code == 201
+        assert Conversation.objects.filter(title="Zipped").exists()
+    
+    def test_import_all_invalid(self, client):
+        """Test that a body with no valid transcripts is rejected"""
+        line = json.dumps({"messages": [{"role": "robot", "text": "beep"}]})
+        resp = client.post("/api/import/", data=line, content_type="application/x-ndjson")
+        
+        assert resp.status_code == 400
+        assert "role" in resp.json()["errors"][0]["error"]
+
+
+@pytest.mark.django_db
+class TestArchivedConversationAPI:
+    """Tests for transparent rehydration of archived conversations"""
+    
+    def _archived(self):
+        from chat.utils.archive import archive_conversations
+        conv = Conversation.objects.create(title="Old")
+        Message.objects.create(conversation=conv, role=Message.ROLE_USER, text="Hello")
+        reply = Message.objects.create(conversation=conv, role=Message.ROLE_AI, text="Hi there")
+        MessageFeedback.objects.create(message=reply, rating=4)
+        archive_conversations([conv.pk])
+        return conv, reply
+    
+    def test_list_messages_rehydrates(self, client):
+        """Test that listing messages of an archived conversation restores them"""
+        conv, reply = self._archived()
+        assert not Message.objects.filter(conversation=conv).exists()
+        
+        resp = client.get(f"/api/conversations/{conv.pk}/messages/")
+        
+        assert resp.status_code == 200
+        data = resp.json()
+        assert [m["text"] for m in data["results"]] == ["Hello", "Hi there"]
+        assert data["results"][1]["id"] == reply.pk
+        assert data["lastSeq"] == 2
+        conv.refresh_from_db()
+        assert conv.archived_at is None
+        assert MessageFeedback.objects.get(message_id=reply.pk).rating == 4
+    
+    def test_detail_rehydrates(self, client):
+        """Test that opening an archived conversation restores its messages"""
+        conv, _ = self._archived()
+        
+        resp = client.get(f"/api/conversations/{conv.pk}/")
+        
+        assert resp.status_code == 200
+        assert resp.json()["message_count"] == 2
+        assert Message.objects.filter(conversation=conv).count() == 2
+    
+    def test_post_message_continues_sequence(self, client, monkeypatch):
+        """Test that replying to an archived conversation appends after the archived messages"""
+        monkeypatch.setattr(gemini, "generate_reply", lambda history, prompt, timeout_s=10: f"seen {len(history)}")
+        conv, _ = self._archived()
+        
+        resp = client.post(
+            f"/api/conversations/{conv.pk}/messages/", data=json.dumps({"text": "Again"}), content_type="application/json"
+        )
+        
+        assert resp.status_code == 201
+        assert resp.json()["user_message"]["sequence"] == 3
+        assert resp.json()["ai_message"]["text"] == "seen 3"
@@ -0,0 +1,137 @@
+"""
+Unit tests for management commands
+"""
+
+import gzip
+import io
+import json
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.utils import timezone
+
+from chat.models import ChatCounter, Conversation, ConversationArchive, Message, MessageFeedback
+from chat.utils.archive import archive_conversations, rehydrate
+from chat.utils.export import iter_export_records
+
+
+@pytest.mark.django_db
+class TestExportChatData:
+    """Tests for the export_chat_data command"""
+    
+    def test_messages_follow_their_conversation(self):
+        """Test that the merge walk keeps messages under the right conversation"""
+        first = Conversation.objects.create(title="First")
+        second = Conversation.objects.create(title="Second")
+        Message.objects.create(conversation=second, role=Message.ROLE_USER, text="b1")
+        Message.objects.create(conversation=first, role=Message.ROLE_USER, text="a1")
+        Message.objects.create(conversation=second, role=Message.ROLE_AI, text="b2")
+        
+        records = list(iter_export_records(chunk_size=1))
+        
+        owner = None
+        for record in records:
+            if record["type"] == "conversation":
+                owner = record["id"]
+            elif record["type"] == "message":
+                assert record["conversation_id"] == owner
+        assert [r["text"] for r in records if r["type"] == "message"] == ["a1", "b1", "b2"]
+    
+    def test_export_to_gzip_file(self, tmp_path):
+        """Test exporting to a gzipped file"""
+        conv = Conversation.objects.create(title="File")
+        msg = Message.objects.create(conversation=conv, role=Message.ROLE_AI, text="Reply")
+        MessageFeedback.objects.create(message=msg, rating=2)
+        path = tmp_path / "export.ndjson.gz"
+        
+        call_command("export_chat_data", "--output", str(path), "--gzip")
+        
+        records = [json.loads(line) for line in gzip.decompress(path.read_bytes()).splitlines()]
+        assert [r["type"] for r in records] == ["conversation", "message", "message_feedback"]
+
+
+@pytest.mark.django_db
+class TestImportTranscripts:
+    """Tests for the import_transcripts command"""
+    
+    def test_round_trip_counts_and_batches(self, tmp_path):
+        """Test importing many transcripts across several small batches"""
+        path = tmp_path / "transcripts.ndjson"
+        path.write_text("\n".join(
+            json.dumps({"title": f"Chat {i}", "messages": [
+                {"role": "user", "text": f"q{i}"},
+                {"role": "ai", "text": f"a{i}", "feedback": {"rating": 1 + i % 5}},
+            ]})
+            for i in range(25)
+        ))
+        before = ChatCounter.get_value(ChatCounter.CONVERSATIONS)
+        
+        call_command("import_transcripts", str(path), "--batch-size", "10")
+        
+        assert Conversation.objects.filter(title__startswith="Chat ").count() == 25
+        assert Message.objects.count() == 50
+        assert MessageFeedback.objects.count() == 25
+        assert ChatCounter.get_value(ChatCounter.CONVERSATIONS) == before + 25
+        conv = Conversation.objects.get(title="Chat 7")
+        assert conv.last_message_at == conv.messages.get(sequence=2).created_at
+
+
+@pytest.mark.django_db
+class TestArchiveConversations:
+    """Tests for the archive_conversations command"""
+    
+    def _conversation(self, title, idle_days):
+        conv = Conversation.objects.create(title=title)
+        Message.objects.create(conversation=conv, role=Message.ROLE_USER, text=f"{title} question")
+        msg = Message.objects.create(conversation=conv, role=Message.ROLE_AI, text=f"{title} answer " * 50)
+        Conversation.objects.filter(pk=conv.pk).update(updated_at=timezone.now() - timedelta(days=idle_days))
+        return conv, msg
+    
+    def test_archives_only_idle_conversations(self):
+        """Test that idle conversations move to cold storage and active ones stay"""
+        old, _ = self._conversation("Old", idle_days=120)
+        recent, _ = self._conversation("Recent", idle_days=1)
+        
+        call_command("archive_conversations", "--idle-days", "90", stdout=io.StringIO())
+        
+        old.refresh_from_db()
+        assert old.archived_at is not None
+        assert old.message_count == 2
+        assert not Message.objects.filter(conversation=old).exists()
+        archive = ConversationArchive.objects.get(conversation=old)
+        assert archive.message_count == 2
+        assert len(archive.payload) < archive.raw_size
+        assert Message.objects.filter(conversation=recent).count() == 2
+        assert ChatCounter.get_value(ChatCounter.CONVERSATIONS) == 2
+    
+    def test_rehydrate_restores_ids_and_timestamps(self):
+        """Test that rehydration restores messages and feedback exactly"""
+        conv, msg = self._conversation("Exact", idle_days=120)
+        feedback = MessageFeedback.objects.create(message=msg, rating=3, comment="ok")
+        before = list(Message.objects.filter(conversation=conv).values("id", "sequence", "text", "created_at"))
+        updated_at = Conversation.objects.get(pk=conv.pk).updated_at
+        
+        archive_conversations([conv.pk])
+        conv.refresh_from_db()
+        assert rehydrate(conv) is True
+        
+        assert list(Message.objects.filter(conversation=conv).values("id", "sequence", "text", "created_at")) == before
+        restored = MessageFeedback.objects.get(message_id=msg.pk)
+        assert (restored.pk, restored.comment, restored.created_at) == (feedback.pk, "ok", feedback.created_at)
+        conv.refresh_from_db()
+        assert conv.archived_at is None
+        assert conv.updated_at == updated_at
+        assert not ConversationArchive.objects.exists()
+    
+    def test_export_includes_archived_messages(self):
+        """Test that the export reads archived messages from cold storage"""
+        archived, _ = self._conversation("Archived", idle_days=120)
+        self._conversation("Hot", idle_days=1)
+        archive_conversations([archived.pk])
+        
+        records = list(iter_export_records(chunk_size=1))
+        
+        texts = [r["text"] for r in records if r["type"] == "message"]
+        assert texts[0] == "Archived question"
+        assert texts[2] == "Hot question"
+        assert len(texts) == 4
@@ -0,0 +1,151 @@
+"""
+Unit tests for database configuration
+"""
+
+import time
+
+import pytest
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from chat import routers
+from chat.middleware import ReadReplicaPinningMiddleware
+from chat.models import Conversation
+from chat.routers import ReadReplicaRouter
+
+
+@pytest.mark.django_db
+class TestSQLiteProductionProfile:
+    """Tests for the production SQLite profile"""
+    
+    def _connect(self, tmp_path):
+        db = DatabaseWrapper({
+            **settings.DATABASES["default"],
+            "NAME": str(tmp_path / "profile.sqlite3"),
+            "OPTIONS": settings.SQLITE_PRODUCTION_OPTIONS,
+            "CONN_MAX_AGE": 600,
+            "CONN_HEALTH_CHECKS": True,
+            "TIME_ZONE": None,
+            "AUTOCOMMIT": True,
+            "ATOMIC_REQUESTS": False,
+        })
+        db.ensure_connection()
+        return db
+    
+    def _pragma(self, db, name):
+        with db.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+    
+    def test_pragmas_applied_on_connect(self, tmp_path):
+        """Test that every new connection gets the tuned pragmas"""
+        db = self._connect(tmp_path)
+        try:
+            assert self._pragma(db, "journal_mode") == "wal"
+            assert self._pragma(db, "synchronous") == 1  # NORMAL
+            assert self._pragma(db, "busy_timeout") == settings.SQLITE_BUSY_TIMEOUT_S * 1000
+            assert self._pragma(db, "cache_size") < 0
+        finally:
+            db.close()
+    
+    def test_write_transactions_begin_immediate(self, tmp_path):
+        """Test that atomic blocks take the write lock up front"""
+        db = self._connect(tmp_path)
+        try:
+            assert db.transaction_mode == "IMMEDIATE"
+        finally:
+            db.close()
+
+
+@pytest.fixture
+def replica_settings(settings, monkeypatch):
+    monkeypatch.setitem(settings.DATABASES, "replica", settings.DATABASES["default"])
+    settings.DATABASE_READ_ALIAS = "replica"
+    settings.DATABASE_READ_STICKY_SECONDS = 5
+    routers.start_request()
+    yield settings
+    routers.start_request()
+
+
+class TestReadReplicaRouter:
+    """Tests for ReadReplicaRouter"""
+    
+    def test_reads_go_to_replica(self, replica_settings):
+        """Test that unpinned reads use the configured read alias"""
+        assert ReadReplicaRouter().db_for_read(Conversation) == "replica"
+    
+    def test_writes_go_to_primary_and_pin(self, replica_settings):
+        """Test that a write pins later reads to the primary"""
+        router = ReadReplicaRouter()
+        assert router.db_for_write(Conversation) == "default"
+        assert router.db_for_read(Conversation) == "default"
+    
+    def test_unconfigured_alias_falls_back_to_default(self, settings):
+        """Test that an unknown read alias is ignored"""
+        settings.DATABASE_READ_ALIAS = "missing"
+        routers.start_request()
+        assert ReadReplicaRouter().db_for_read(Conversation) == "default"
+    
+    def test_only_default_is_migrated(self):
+        """Test that migrations never run against the replica"""
+        router = ReadReplicaRouter()
+        assert router.allow_migrate("default", "chat")
+        assert not router.allow_migrate("replica", "chat")
+
+
+class TestReadReplicaPinningMiddleware:
+    """Tests for ReadReplicaPinningMiddleware"""
+    
+    def _middleware(self, write=False):
+        seen = {}
+        
+        def get_response(request):
+            router = ReadReplicaRouter()
+            seen["before"] = router.db_for_read(Conversation)
+            if write:
+                router.db_for_write(Conversation)
+            return HttpResponse()
+        
+        return ReadReplicaPinningMiddleware(get_response), seen
+    
+    def test_get_reads_from_replica(self, replica_settings):
+        """Test that a fresh client's GET reads from the replica"""
+        middleware, seen = self._middleware()
+        response = middleware(RequestFactory().get("/api/conversations/"))
+        
+        assert seen["before"] == "replica"
+        assert ReadReplicaPinningMiddleware.cookie_name not in response.cookies
+    
+    def test_post_is_pinned_and_sets_cookie(self, replica_settings):
+        """Test that a write request reads from the primary and sets the sticky cookie"""
+        middleware, seen = self._middleware(write=True)
+        response = middleware(RequestFactory().post("/api/conversations/"))
+        
+        assert seen["before"] == "default"
+        assert ReadReplicaPinningMiddleware.cookie_name in response.cookies
+    
+    def test_recent_writer_reads_from_primary(self, replica_settings):
+        """Test read-your-writes stickiness within the window"""
+        middleware, seen = self._middleware()
+        request = RequestFactory().get("/api/conversations/")
+        request.COOKIES[ReadReplicaPinningMiddleware.cookie_name] = str(time.time() + 5)
+        middleware(request)
+        
+        assert seen["before"] == "default"
+    
+    def test_expired_window_reads_from_replica(self, replica_settings):
+        """Test that stickiness expires"""
+        middleware, seen = self._middleware()
+        request = RequestFactory().get("/api/conversations/")
+        request.COOKIES[ReadReplicaPinningMiddleware.cookie_name] = str(time.time() - 1)
+        middleware(request)
+        
+        assert seen["before"] == "replica"
+    
+    def test_not_used_without_replica(self):
+        """Test that the middleware is skipped when reads go to default"""
+        with pytest.raises(MiddlewareNotUsed):
+            ReadReplicaPinningMiddleware(lambda request: HttpResponse())
@@ -0,0 +1,90 @@
+"""
+Unit tests for custom middleware
+"""
+
+import json
+import pytest
+
+from chat.models import Conversation, Message
+from chat.services import gemini
+from chat.utils import instrumentation
+
+
+@pytest.fixture
+def instrumented(settings):
+    settings.CHAT_INSTRUMENTATION = True
+    settings.CHAT_PROFILE_SAMPLE_RATE = 0
+    instrumentation.clear_recent_requests()
+    yield settings
+    instrumentation.clear_recent_requests()
+
+
+@pytest.mark.django_db
+class TestRequestInstrumentationMiddleware:
+    """Tests for RequestInstrumentationMiddleware"""
+
+    def test_disabled_by_default(self, client):
+        """Test that no Server-Timing header is sent unless enabled"""
+        resp = client.get("/api/conversations/")
+
+        assert resp.status_code == 200
+        assert "Server-Timing" not in resp
+
+    def test_server_timing_header(self, client, instrumented):
+        """Test that db, serializer and total timings are reported"""
+        Conversation.objects.create(title="Timed")
+
+        resp = client.get("/api/conversations/")
+
+        header = resp["Server-Timing"]
+        assert "db;dur=" in header
+        assert "serialize;dur=" in header
+        assert "total;dur=" in header
+
+    def test_llm_time_recorded(self, client, instrumented, monkeypatch):
+        """Test that time inside the LLM call is attributed to the llm phase"""
+        conv = Conversation.objects.create()
+
+        def fake_generate_reply(history, prompt, timeout_s=10):
+            with instrumentation.timed("llm"):
+                return "Hi there!"
+
+        monkeypatch.setattr(gemini, "generate_reply", fake_generate_reply)
+        resp = client.post(
+            f"/api/conversations/{conv.id}/messages/",
+            data=json.dumps({"text": "Hello"}),
+            content_type="application/json",
+        )
+
+        assert resp.status_code == 201
+        assert "llm;dur=" in resp["Server-Timing"]
+
+    def test_ring_buffer_endpoint(self, client, instrumented):
+        """Test that recent requests are exposed at the debug endpoint"""
+        instrumented.DEBUG = True
+        conv = Conversation.objects.create()
+        Message.objects.create(conversation=conv, role=Message.ROLE_USER, text="Hi")
+        client.get(f"/api/conversations/{conv.id}/messages/")
+
+        resp = client.get("/api/debug/requests/")
+
+        assert resp.status_code == 200
+        entry = resp.json()["results"][0]
+        assert entry["path"] == f"/api/conversations/{conv.id}/messages/"
+        assert entry["status"] == 200
+        assert entry["phases"]["db"]["count"] >= 2
+
+    def test_ring_buffer_endpoint_hidden_when_disabled(self, client):
+        """Test that the debug endpoint 404s when instrumentation is off"""
+        resp = client.get("/api/debug/requests/")
+
+        assert resp.status_code == 404
+
+    def test_profile_sampling(self, client, instrumented):
+        """Test that 1-in-N sampling attaches a cProfile summary"""
+        instrumented.CHAT_PROFILE_SAMPLE_RATE = 1
+
+        client.get("/api/conversations/")
+
+        entry = instrumentation.recent_requests()[0]
+        assert "cumulative" in entry["profile"]
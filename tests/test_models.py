@@ -6,7 +6,7 @@ import pytest
 from django.utils import timezone
 from datetime import timedelta
 
-from chat.models import Conversation, Message, MessageFeedback, ConversationFeedback
+from chat.models import ChatCounter, Conversation, Message, MessageFeedback, ConversationFeedback
 
 
 @pytest.mark.django_db
@@ -39,6 +39,26 @@ class TestConversation:
         assert conversations[1].id == conv2.id
 
 
+@pytest.mark.django_db
+class TestChatCounter:
+    """Tests for the global ChatCounter"""
+    
+    def test_conversation_total_tracks_creates_and_deletes(self):
+        """Test that the conversation total follows creates and deletes"""
+        start = ChatCounter.get_value(ChatCounter.CONVERSATIONS)
+        conv = Conversation.objects.create()
+        Conversation.objects.create()
+        assert ChatCounter.get_value(ChatCounter.CONVERSATIONS) == start + 2
+        
+        conv.delete()
+        assert ChatCounter.get_value(ChatCounter.CONVERSATIONS) == start + 1
+    
+    def test_add_creates_missing_counter(self):
+        """Test that adding to an unknown counter creates it"""
+        ChatCounter.add("widgets", 3)
+        assert ChatCounter.get_value("widgets") == 3
+
+
 @pytest.mark.django_db
 class TestMessage:
     """Tests for Message model"""
@@ -76,6 +96,27 @@ class TestMessage:
         assert messages[0].id == msg1.id
         assert messages[1].id == msg2.id
     
+    def test_message_updates_conversation_counters(self):
+        """Test that appending a message maintains the denormalized counters"""
+        conv = Conversation.objects.create()
+        Message.objects.create(conversation=conv, role=Message.ROLE_USER, text="Hello")
+        reply = Message.objects.create(conversation=conv, role=Message.ROLE_AI, text="x" * 500)
+        conv.refresh_from_db()
+        
+        assert conv.message_count == 2
+        assert conv.last_message_at == reply.created_at
+        assert conv.last_message_preview == "x" * Conversation.PREVIEW_LENGTH
+    
+    def test_resaving_message_does_not_recount(self):
+        """Test that updating an existing message leaves the count alone"""
+        conv = Conversation.objects.create()
+        msg = Message.objects.create(conversation=conv, role=Message.ROLE_USER, text="Hello")
+        msg.text = "Edited"
+        msg.save()
+        conv.refresh_from_db()
+        
+        assert conv.message_count == 1
+    
     def test_message_string_representation(self):
         """Test message string representation"""
         conv = Conversation.objects.create()
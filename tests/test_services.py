@@ -8,6 +8,7 @@ import sys
 from unittest.mock import patch, MagicMock
 
 from chat.services.gemini import generate_reply, GeminiServiceError, _get_model_name
+from chat.utils import metrics
 
 
 class TestGeminiService:
@@ -90,6 +91,22 @@ class TestGeminiService:
             
             assert "request failed" in str(exc_info.value).lower()
     
+    @patch.dict(os.environ, {"GEMINI_API_KEY": "test-key", "GEMINI_MODEL": "test-model"})
+    def test_generate_reply_error_metrics(self):
+        """Test that failures are counted by underlying error class"""
+        mock_genai_module = MagicMock()
+        mock_model = MagicMock()
+        mock_model.generate_content.side_effect = TimeoutError("deadline")
+        mock_genai_module.GenerativeModel.return_value = mock_model
+        key = ("reply", "TimeoutError")
+        before = metrics.LLM_ERRORS.samples.get(key, 0)
+        
+        with patch.dict(sys.modules, {'google.generativeai': mock_genai_module}):
+            with pytest.raises(GeminiServiceError):
+                generate_reply([], "Test")
+        
+        assert metrics.LLM_ERRORS.samples[key] == before + 1
+    
     @patch.dict(os.environ, {"GEMINI_API_KEY": "test-key", "GEMINI_MODEL": "test-model"})
     def test_generate_reply_with_history(self):
         """Test reply generation with conversation history"""
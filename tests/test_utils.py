@@ -15,6 +15,7 @@ from chat.utils.insights import (
     get_insights_data
 )
 from chat.utils.title_generation import generate_title_with_gemini, generate_fallback_title
+from chat.utils import compression, metrics
 
 
 @pytest.mark.django_db
@@ -151,3 +152,79 @@ class TestTitleGeneration:
         if len(title) > 11:
             assert title.endswith("...")
 
+
+
+class TestMetrics:
+    """Tests for the in-process metrics registry"""
+    
+    def test_counter_exposition(self):
+        """Test that counters are rendered in text exposition format"""
+        metrics.TITLE_GENERATION.inc(result="fallback")
+        text = metrics.REGISTRY.exposition()
+        
+        assert "# TYPE chat_title_generation_total counter" in text
+        assert 'chat_title_generation_total{result="fallback"}' in text
+    
+    def test_histogram_exposition(self):
+        """Test that histograms render cumulative buckets, sum and count"""
+        before = metrics.INSIGHTS_DURATION.samples.get((), [0] * 15)[-1]
+        metrics.INSIGHTS_DURATION.observe(0.02)
+        text = metrics.REGISTRY.exposition()
+        
+        assert 'chat_insights_duration_seconds_bucket{le="+Inf"} ' in text
+        assert f"chat_insights_duration_seconds_count {before + 1}" in text
+    
+    def test_label_escaping(self):
+        """Test that label values are escaped"""
+        metrics.LLM_ERRORS.inc(operation="reply", error='Bad "quote"')
+        text = metrics.REGISTRY.exposition()
+        
+        assert 'error="Bad \\"quote\\""' in text
+    
+    def test_merges_other_worker_snapshots(self, settings, tmp_path):
+        """Test that samples written by other workers are summed into the output"""
+        settings.CHAT_METRICS_DIR = str(tmp_path)
+        own = metrics.REGISTRY.snapshot()["chat_title_generation_total"]
+        key = '["generated"]'
+        (tmp_path / "metrics-1-deadbeef.json").write_text(
+            '{"chat_title_generation_total": {"[\\"generated\\"]": 5.0}}'
+        )
+        
+        merged = metrics.REGISTRY.collect()
+        assert merged["chat_title_generation_total"][key] == own.get(key, 0) + 5.0
+    
+    def test_flush_writes_snapshot(self, settings, tmp_path):
+        """Test that a worker writes its own snapshot file"""
+        settings.CHAT_METRICS_DIR = str(tmp_path)
+        metrics.TITLE_GENERATION.inc(result="generated")
+        metrics.REGISTRY.flush()
+        
+        assert len(list(tmp_path.glob("metrics-*.json"))) == 1
+
+
+class TestCompression:
+    """Tests for the codec-tagged compression helpers"""
+    
+    def test_zlib_round_trip(self):
+        """Test that zlib blobs carry their codec and decompress"""
+        data = ("markdown " * 500).encode()
+        blob = compression.compress(data, codec=compression.CODEC_ZLIB)
+        
+        assert blob[0] == compression.CODEC_ZLIB
+        assert len(blob) < len(data)
+        assert compression.decompress(memoryview(blob)) == data
+    
+    def test_zstd_requires_package(self, settings, monkeypatch):
+        """Test that asking for zstd without the package fails loudly"""
+        monkeypatch.setattr(compression, "zstandard", None)
+        settings.CHAT_COMPRESSION_CODEC = "zstd"
+        
+        with pytest.raises(compression.CompressionError):
+            compression.compress(b"data")
+        settings.CHAT_COMPRESSION_CODEC = "auto"
+        assert compression.compress(b"data")[0] == compression.CODEC_ZLIB
+    
+    def test_unknown_codec(self):
+        """Test that unknown codec tags are rejected"""
+        with pytest.raises(compression.CompressionError):
+            compression.decompress(b"\x09abc")